@@ -0,0 +1,111 @@
+"""
+Per-row error collection for batch runs.
+Creative Cash Draw Solutions - Change Calculator
+
+A BatchErrors object is passed to process_file / process_file_content and
+collects one (line_num, code, detail) record per failed row. The policy
+decides what happens to the batch:
+
+    continue   keep going; error rows stay in the output as "Error: ..." lines
+    fail_fast  stop once max_errors rows have failed (default 1)
+    partial    keep going; error rows are left out of the output and only
+               reported through the error index
+
+Failures that stop the whole file (e.g. a missing input file) are recorded
+with line_num None and always abort the batch.
+"""
+
+ERROR_PREFIX = 'Error: '
+ERROR_POLICIES = ('continue', 'fail_fast', 'partial')
+
+class RowError(Exception):
+    """
+    A row that could not be processed.
+
+    Attributes:
+        code (str): Short machine-readable error code (e.g. 'insufficient_payment')
+        detail (str): Optional short detail, such as the offending value
+    """
+
+    def __init__(self, code, message, detail=None):
+        """
+        Args:
+            code (str): Error code
+            message (str): Human-readable message, used for inline output
+            detail (str): Optional short detail
+        """
+        super().__init__(message)
+        self.code = code
+        self.detail = detail
+
+class BatchErrors:
+    """Collects per-row errors for a batch under an error policy."""
+
+    def __init__(self, policy='continue', max_errors=None):
+        """
+        Args:
+            policy (str): One of ERROR_POLICIES. Defaults to continue.
+            max_errors (int): Errors allowed before a fail_fast batch stops.
+                Only valid with fail_fast.
+        """
+        if policy not in ERROR_POLICIES:
+            raise ValueError(f"Unsupported error policy '{policy}'. Supported: {', '.join(ERROR_POLICIES)}")
+        if max_errors is not None:
+            if policy != 'fail_fast':
+                raise ValueError("max_errors is only supported with the fail_fast policy")
+            if max_errors < 1:
+                raise ValueError("max_errors must be at least 1")
+        self.policy = policy
+        self.max_errors = max_errors if max_errors is not None else 1
+        self.records = []
+        self.aborted = False
+
+    @property
+    def inline(self):
+        """bool: True if error rows are written to the output."""
+        return self.policy != 'partial'
+
+    def add(self, line_num, error):
+        """
+        Record a failed row.
+
+        Args:
+            line_num (int): 1-based line number of the row
+            error (RowError): The row's error
+
+        Returns:
+            str: "Error: ..." line for the output, or None if error rows
+                are left out of the output
+        """
+        self.records.append((line_num, error.code, error.detail))
+        if self.policy == 'fail_fast' and len(self.records) >= self.max_errors:
+            self.aborted = True
+        return f"{ERROR_PREFIX}{error}" if self.inline else None
+
+    def fail(self, error, line_num=None):
+        """
+        Record a failure that stops the whole batch.
+
+        Args:
+            error (RowError): The error
+            line_num (int): Line being processed, or None for the whole file
+        """
+        self.records.append((line_num, error.code, error.detail))
+        self.aborted = True
+
+    def to_dict(self):
+        """
+        Get the errors in a JSON-friendly form.
+
+        Returns:
+            dict: Policy, error count, aborted flag and error index
+        """
+        return {
+            'policy': self.policy,
+            'error_count': len(self.records),
+            'aborted': self.aborted,
+            'errors': [list(record) for record in self.records]
+        }
+
+    def __len__(self):
+        return len(self.records)
@@ -0,0 +1,25 @@
+"""
+Shared helpers for tests that run batch files.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+@contextmanager
+def batch_files(content, mode='w'):
+    """
+    Write batch input to a temporary directory.
+
+    Args:
+        content (str|bytes): Input file content
+        mode (str): File mode for writing the input ('w' or 'wb')
+
+    Yields:
+        tuple: (input_path, output_path) inside the temporary directory
+    """
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_path = os.path.join(tmpdir, 'input.txt')
+        with open(input_path, mode) as f:
+            f.write(content)
+        yield input_path, os.path.join(tmpdir, 'output.txt')
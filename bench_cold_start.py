@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the Lambda container image.
+Creative Cash Draw Solutions - Change Calculator
+
+Container mode starts a fresh container from each image with the Lambda
+runtime interface emulator (the same setup as test_container.py). It times
+`docker run` separately from the wait until the first invocation returns, so
+Docker's container setup doesn't hide differences in import and init time:
+
+    python bench_cold_start.py --image change-calculator:latest --image change-calculator:old
+
+Local mode (no Docker) times a fresh interpreter importing the handler and
+serving one request, with and without precompiled bytecode:
+
+    python bench_cold_start.py --local
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+# Modules copied into the image by the Dockerfile
+APP_MODULES = ['change_calculator.py', 'currencies.py', 'lambda_function.py', 'profiling.py', 'batch_errors.py']
+INVOKE_PATH = '/2015-03-31/functions/function/invocations'
+TEST_EVENT = {'body': '2.13,3.00\n2.14,3.00\n5.00,5.00', 'queryStringParameters': {'seed': 'bench'}}
+
+LOCAL_SCRIPT = '''
+import json, time
+start = time.perf_counter()
+from lambda_function import lambda_handler
+lambda_handler(json.loads(%r), None)
+print(time.perf_counter() - start)
+''' % json.dumps(TEST_EVENT)
+
+def invoke(port, timeout=5.0):
+    """
+    Send the test event to the emulator.
+
+    Args:
+        port (int): Host port mapped to the emulator
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        dict: Lambda response
+    """
+    request = urllib.request.Request(f"http://localhost:{port}{INVOKE_PATH}",
+                                     data=json.dumps(TEST_EVENT).encode(), method='POST')
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+def container_cold_start(image, port, timeout=30.0):
+    """
+    Time one cold start of a container image.
+
+    Docker's own container setup is timed separately, so the cold time
+    covers only the emulator, the Python import and init().
+
+    Args:
+        image (str): Docker image to run
+        port (int): Host port to map to the emulator
+        timeout (float): Seconds to wait for the first response
+
+    Returns:
+        tuple: (seconds for docker run, seconds from docker run returning to
+            the first response, seconds for a warm invocation)
+    """
+    run_start = time.perf_counter()
+    container_id = subprocess.run(['docker', 'run', '-d', '--rm', '-p', f'{port}:8080', image],
+                                  check=True, capture_output=True, text=True).stdout.strip()
+    start = time.perf_counter()
+    docker_run = start - run_start
+    try:
+        while True:
+            try:
+                invoke(port)
+                break
+            except (urllib.error.URLError, ConnectionError, TimeoutError, socket.timeout):
+                # Emulator not listening or not answering yet
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"No response from {image} after {timeout}s")
+                time.sleep(0.01)
+        cold = time.perf_counter() - start
+
+        warm_start = time.perf_counter()
+        invoke(port)
+        warm = time.perf_counter() - warm_start
+        return docker_run, cold, warm
+    finally:
+        subprocess.run(['docker', 'rm', '-f', container_id], capture_output=True)
+
+def local_cold_start(precompiled):
+    """
+    Time a fresh interpreter importing the handler and serving one request.
+
+    The app modules are copied to a temporary directory so only their
+    bytecode differs between runs; the stdlib keeps its installed .pyc files.
+
+    Args:
+        precompiled (bool): Use bytecode compiled ahead of time
+
+    Returns:
+        float: Seconds from the start of the import to the response
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as app_dir:
+        for module in APP_MODULES:
+            shutil.copy(os.path.join(root, module), app_dir)
+        if precompiled:
+            subprocess.run([sys.executable, '-m', 'compileall', '-q', '--invalidation-mode',
+                            'unchecked-hash', app_dir], check=True)
+        # Don't let the first run write bytecode for the next one
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+        env.pop('PYTHONPYCACHEPREFIX', None)
+        result = subprocess.run([sys.executable, '-c', LOCAL_SCRIPT], cwd=app_dir, env=env,
+                                check=True, capture_output=True, text=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+def report(label, samples):
+    samples = sorted(samples)
+    p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))]
+    print(f"{label:<40} min {samples[0] * 1000:8.1f} ms  median {statistics.median(samples) * 1000:8.1f} ms  "
+          f"p90 {p90 * 1000:8.1f} ms  max {samples[-1] * 1000:8.1f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Cold-start benchmark')
+    parser.add_argument('--image', action='append', default=[], help='Image to benchmark (repeatable)')
+    parser.add_argument('--local', action='store_true', help='Benchmark a local interpreter instead of Docker')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--port', type=int, default=9000)
+    args = parser.parse_args(argv)
+
+    if not args.local and not args.image:
+        parser.error('pass --image for the emulator benchmark or --local')
+
+    print(f"Cold-start benchmark, {args.runs} runs each")
+    if args.local:
+        for precompiled in (False, True):
+            label = 'local, precompiled bytecode' if precompiled else 'local, no bytecode'
+            report(label, [local_cold_start(precompiled) for _ in range(args.runs)])
+
+    for image in args.image:
+        docker_run, cold, warm = zip(*[container_cold_start(image, args.port) for _ in range(args.runs)])
+        report(f"{image} docker run", docker_run)
+        report(f"{image} cold (first invoke)", cold)
+        report(f"{image} warm", warm)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,29 @@
 import random
 import math
-from currencies import get_currency_config, format_denomination_name, get_supported_currencies
+from currencies import (get_currency_config, format_denomination_name, get_supported_currencies,
+                        build_denomination_index)
+from profiling import get_profiler
+from batch_errors import BatchErrors, RowError
 
-def calculate_change(owed_str, paid_str, currency='USD'):
+def row_rng(seed, line_num):
+    """
+    Build the random stream for a single row of a seeded batch.
+
+    The stream is keyed by the batch seed and the row's line number only,
+    so a row gets the same change no matter how the batch is sharded.
+
+    Args:
+        seed (str|int): Batch seed, or None to use the global random module
+        line_num (int): 1-based line number of the row in the batch
+
+    Returns:
+        random.Random or module: Random source for the row
+    """
+    if seed is None:
+        return random
+    return random.Random(f"{seed}:{line_num}")
+
+def calculate_change(owed_str, paid_str, currency='USD', rng=random):
     """
     Calculate the change denominations for a transaction.
 
@@ -10,23 +31,53 @@ def calculate_change(owed_str, paid_str, currency='USD'):
         owed_str (str): Amount owed as string (e.g., "2.13")
         paid_str (str): Amount paid as string (e.g., "3.00")
         currency (str): Currency code (USD, EUR, COP). Defaults to USD.
+        rng: Random source for random change. Defaults to the random module.
 
     Returns:
         str: Change breakdown or error message
     """
+    try:
+        return compute_change(owed_str, paid_str, currency, rng)
+    except RowError as e:
+        return f"Error: {e}"
+
+def compute_change(owed_str, paid_str, currency='USD', rng=random, row_key=None):
+    """
+    Calculate the change denominations for a transaction.
+
+    Same as calculate_change, but raises RowError instead of returning
+    an error message.
+
+    Args:
+        owed_str (str): Amount owed as string (e.g., "2.13")
+        paid_str (str): Amount paid as string (e.g., "3.00")
+        currency (str): Currency code (USD, EUR, COP). Defaults to USD.
+        rng: Random source for random change. Defaults to the random module.
+        row_key (tuple): (seed, line_num) of a seeded batch row. If given, the
+            row's random stream replaces rng and is only built when the row
+            takes random change.
+
+    Returns:
+        str: Change breakdown
+
+    Raises:
+        RowError: If the amounts or currency are invalid
+    """
     try:
         owed = float(owed_str)
         paid = float(paid_str)
     except ValueError:
-        return "Error: Invalid number format"
+        raise RowError('invalid_number', "Invalid number format", f"{owed_str},{paid_str}")
 
     if paid < owed:
-        return "Error: Insufficient payment"
+        raise RowError('insufficient_payment', "Insufficient payment")
 
     # Get currency configuration
     currency_config = get_currency_config(currency)
     if not currency_config:
-        return f"Error: Unsupported currency '{currency}'. Supported: {', '.join(get_supported_currencies())}"
+        raise RowError('unsupported_currency',
+                       f"Unsupported currency '{currency}'. Supported: {', '.join(get_supported_currencies())}",
+                       currency)
 
     change_cents = round((paid - owed) * 100)
 
@@ -38,7 +89,9 @@ def calculate_change(owed_str, paid_str, currency='USD'):
     is_divisible_by_3 = (owed_cents % 3 == 0)
 
     if is_divisible_by_3:
-        return calculate_random_change(change_cents, currency_config)
+        if row_key is not None:
+            rng = row_rng(*row_key)
+        return calculate_random_change(change_cents, currency_config, rng)
     else:
         return calculate_minimal_change(change_cents, currency_config)
 
@@ -65,7 +118,7 @@ def calculate_minimal_change(change_cents, currency_config):
 
     return ", ".join(result)
 
-def calculate_random_change(change_cents, currency_config):
+def calculate_random_change(change_cents, currency_config, rng=random):
     """
     Calculate change using random valid combinations of denominations.
     Allows more coins than minimal to create variety.
@@ -73,6 +126,7 @@ def calculate_random_change(change_cents, currency_config):
     Args:
         change_cents (int): Change amount in cents
         currency_config (dict): Currency configuration
+        rng: Random source (random.Random or the random module)
 
     Returns:
         str: Formatted change breakdown
@@ -83,7 +137,7 @@ def calculate_random_change(change_cents, currency_config):
 
     # Shuffle denominations for randomness
     shuffled_denoms = denominations.copy()
-    random.shuffle(shuffled_denoms)
+    rng.shuffle(shuffled_denoms)
 
     # Use a greedy approach but with randomness
     for name, value in shuffled_denoms:
@@ -91,7 +145,7 @@ def calculate_random_change(change_cents, currency_config):
             # Randomly decide how many of this denomination to use (0 to remaining/value)
             max_count = remaining // value
             if max_count > 0:
-                count = random.randint(0, max_count)
+                count = rng.randint(0, max_count)
                 if count > 0:
                     remaining -= count * value
                     result.append(format_denomination_name(name, count))
@@ -105,6 +159,8 @@ def calculate_random_change(change_cents, currency_config):
             result.append(format_denomination_name(name, count))
 
     # Sort result for consistent output order
+    denom_dict = currency_config.get('index') or build_denomination_index(currency_config)
+
     def sort_key(item):
         parts = item.split()
         denom_name = parts[1] if len(parts) > 1 else ""
@@ -114,13 +170,44 @@ def calculate_random_change(change_cents, currency_config):
         elif denom_name in ['pennies', 'cents', 'pesos']:
             denom_name = denom_name[:-3] + 'y' if denom_name == 'pennies' else denom_name[:-1]
 
-        denom_dict = {name: i for i, (name, _) in enumerate(denominations)}
         return denom_dict.get(denom_name, 999)
 
     result.sort(key=sort_key)
     return ", ".join(result)
 
-def process_file(input_file_path, output_file_path, currency='USD'):
+def process_row(line, line_num, currency='USD', seed=None):
+    """
+    Calculate change for one "owed,paid" row of a batch.
+
+    Args:
+        line (str|bytes): Row text; bytes are decoded as UTF-8
+        line_num (int): 1-based line number of the row
+        currency (str): Currency code. Defaults to USD.
+        seed (str|int): Batch seed. Defaults to None.
+
+    Returns:
+        str: Change breakdown
+
+    Raises:
+        RowError: If the row cannot be processed
+    """
+    if isinstance(line, bytes):
+        try:
+            line = line.decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise RowError('invalid_encoding', f"Invalid UTF-8 on line {line_num}", str(e.start))
+
+    parts = line.strip().split(',')
+    if len(parts) != 2:
+        raise RowError('invalid_line', f"Invalid line format on line {line_num}")
+
+    owed_str, paid_str = parts
+    # Minimal-change rows never use the random stream, so build it lazily
+    row_key = (seed, line_num) if seed is not None else None
+    return compute_change(owed_str.strip(), paid_str.strip(), currency, row_key=row_key)
+
+def process_file(input_file_path, output_file_path, currency='USD', seed=None, profile=None,
+                 errors=None):
     """
     Process input file and generate output file with change calculations.
 
@@ -128,27 +215,58 @@ def process_file(input_file_path, output_file_path, currency='USD'):
         input_file_path (str): Path to input file
         output_file_path (str): Path to output file
         currency (str): Currency code. Defaults to USD.
+        seed (str|int): Batch seed for reproducible output. Defaults to None.
+        profile (str): Profile mode ('all' or every Nth row). Defaults to the
+            CHANGE_CALC_PROFILE environment variable.
+        errors (BatchErrors): Error collector and policy. Defaults to continue.
+
+    Returns:
+        BatchErrors: Errors collected from the batch
     """
+    if errors is None:
+        errors = BatchErrors()
+    profiler = get_profiler(profile)
     try:
-        with open(input_file_path, 'r') as infile, open(output_file_path, 'w') as outfile:
+        # Read bytes so a bad byte fails its own row instead of the whole file
+        with open(input_file_path, 'rb') as infile, open(output_file_path, 'w') as outfile:
+            if profiler and profiler.whole_run:
+                profiler.enable()
             for line_num, line in enumerate(infile, 1):
-                line = line.strip()
-                if not line:
+                if not line.strip():
                     continue
 
-                parts = line.split(',')
-                if len(parts) != 2:
-                    outfile.write(f"Error: Invalid line format on line {line_num}\n")
-                    continue
+                sampled = profiler is not None and profiler.samples(line_num)
+                if sampled:
+                    profiler.enable()
+                try:
+                    result = process_row(line, line_num, currency, seed)
+                except RowError as e:
+                    result = errors.add(line_num, e)
+                except Exception as e:
+                    # Keep the rows already written; record the failure against this row
+                    result = errors.add(line_num, RowError('exception', str(e), type(e).__name__))
+                if sampled:
+                    profiler.disable()
 
-                owed_str, paid_str = parts
-                result = calculate_change(owed_str.strip(), paid_str.strip(), currency)
-                outfile.write(result + '\n')
+                if errors.aborted:
+                    print(f"Error: Batch aborted after {len(errors)} errors on line {line_num}")
+                    break
+                if result is not None:
+                    outfile.write(result + '\n')
 
     except FileNotFoundError:
         print(f"Error: Input file '{input_file_path}' not found")
+        errors.fail(RowError('file_not_found', f"Input file '{input_file_path}' not found"))
     except Exception as e:
         print(f"Error processing file: {e}")
+        errors.fail(RowError('exception', f"Error processing file: {e}", type(e).__name__))
+    finally:
+        if profiler:
+            profiler.disable()
+            if profiler.profiled:
+                profiler.write(output_file_path)
+
+    return errors
 
 if __name__ == "__main__":
     # Example usage with different currencies
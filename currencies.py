@@ -50,6 +50,22 @@ CURRENCIES = {
     }
 }
 
+def build_denomination_index(currency_config):
+    """
+    Build the lookup from denomination name to its position in the currency.
+
+    Args:
+        currency_config (dict): Currency configuration
+
+    Returns:
+        dict: Denomination name -> position (largest first)
+    """
+    return {name: i for i, (name, _) in enumerate(currency_config['denominations'])}
+
+# Built once at import so the init phase (and any snapshot of it) carries the tables
+for _config in CURRENCIES.values():
+    _config['index'] = build_denomination_index(_config)
+
 def get_currency_config(currency_code):
     """
     Get currency configuration by code.
@@ -87,6 +103,7 @@ def register_custom_currency(currency_code, currency_config):
     if code in CURRENCIES:
         return False
 
+    currency_config['index'] = build_denomination_index(currency_config)
     _CUSTOM_CURRENCIES[code] = currency_config
     return True
 
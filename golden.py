@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Golden-output regression harness for batch files.
+Creative Cash Draw Solutions - Change Calculator
+
+Runs an input corpus through process_file with a fixed seed and compares
+the output against a stored manifest of per-chunk SHA-256 hashes, so large
+batch runs can be checked without keeping the full expected output around.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from change_calculator import process_file
+
+DEFAULT_SEED = 'golden'
+DEFAULT_CHUNK_LINES = 10000
+
+def chunk_digests(file_path, chunk_lines=DEFAULT_CHUNK_LINES):
+    """
+    Hash a file in chunks of lines.
+
+    Args:
+        file_path (str): Path to the file to hash
+        chunk_lines (int): Number of lines per chunk
+
+    Returns:
+        list: Hex SHA-256 digest of each chunk, in order
+    """
+    digests = []
+    digest = hashlib.sha256()
+    count = 0
+    with open(file_path, 'rb') as f:
+        for line in f:
+            digest.update(line)
+            count += 1
+            if count == chunk_lines:
+                digests.append(digest.hexdigest())
+                digest = hashlib.sha256()
+                count = 0
+    if count:
+        digests.append(digest.hexdigest())
+    return digests
+
+def run_batch(input_file_path, currency='USD', seed=DEFAULT_SEED, chunk_lines=DEFAULT_CHUNK_LINES):
+    """
+    Process an input file with a seed and hash the output.
+
+    Args:
+        input_file_path (str): Path to input file
+        currency (str): Currency code. Defaults to USD.
+        seed (str|int): Batch seed
+        chunk_lines (int): Number of output lines per chunk
+
+    Returns:
+        list: Hex SHA-256 digest of each output chunk
+    """
+    fd, output_file_path = tempfile.mkstemp(suffix='.txt')
+    os.close(fd)
+    try:
+        # Profile files would be left behind next to the temporary output
+        process_file(input_file_path, output_file_path, currency, seed, profile='off')
+        return chunk_digests(output_file_path, chunk_lines)
+    finally:
+        os.remove(output_file_path)
+
+def record_golden(input_file_path, golden_path, currency='USD', seed=DEFAULT_SEED,
+                  chunk_lines=DEFAULT_CHUNK_LINES):
+    """
+    Record a golden manifest for an input file.
+
+    Args:
+        input_file_path (str): Path to input file
+        golden_path (str): Path to write the JSON manifest to
+        currency (str): Currency code. Defaults to USD.
+        seed (str|int): Batch seed
+        chunk_lines (int): Number of output lines per chunk
+
+    Returns:
+        dict: The recorded manifest
+    """
+    manifest = {
+        'currency': currency,
+        'seed': seed,
+        'chunk_lines': chunk_lines,
+        'chunks': run_batch(input_file_path, currency, seed, chunk_lines)
+    }
+    with open(golden_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+    return manifest
+
+def check_golden(input_file_path, golden_path):
+    """
+    Check an input file's output against a golden manifest.
+
+    Args:
+        input_file_path (str): Path to input file
+        golden_path (str): Path to the JSON manifest
+
+    Returns:
+        list: Indices of chunks that differ (empty if the output matches)
+    """
+    with open(golden_path, 'r') as f:
+        manifest = json.load(f)
+
+    expected = manifest['chunks']
+    actual = run_batch(input_file_path, manifest['currency'], manifest['seed'],
+                       manifest['chunk_lines'])
+
+    mismatches = [i for i, (a, b) in enumerate(zip(actual, expected)) if a != b]
+    # A length difference means every chunk past the shorter run differs
+    mismatches.extend(range(min(len(actual), len(expected)), max(len(actual), len(expected))))
+    return mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Golden-output regression harness')
+    parser.add_argument('command', choices=['record', 'check'])
+    parser.add_argument('input_file')
+    parser.add_argument('golden_file')
+    parser.add_argument('--currency', default='USD')
+    parser.add_argument('--seed', default=DEFAULT_SEED)
+    parser.add_argument('--chunk-lines', type=int, default=DEFAULT_CHUNK_LINES)
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        manifest = record_golden(args.input_file, args.golden_file, args.currency.upper(),
+                                 args.seed, args.chunk_lines)
+        print(f"Recorded {len(manifest['chunks'])} chunks to {args.golden_file}")
+        return 0
+
+    mismatches = check_golden(args.input_file, args.golden_file)
+    if mismatches:
+        print(f"Golden check failed: {len(mismatches)} chunk(s) differ: {mismatches}")
+        return 1
+    print("Golden check passed")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,43 @@
 import json
-import boto3
 import random
 from io import StringIO
-from change_calculator import calculate_change
-from currencies import get_supported_currencies, load_custom_currency, register_custom_currency
+from change_calculator import calculate_change, calculate_minimal_change, calculate_random_change, process_row
+from currencies import (CURRENCIES, get_supported_currencies, load_custom_currency,
+                        register_custom_currency)
+from profiling import get_profiler
+from batch_errors import BatchErrors, RowError, ERROR_POLICIES
+
+try:
+    # Lambda SnapStart runtime hooks. Only present in the managed Python 3.12+
+    # runtime (zip deployment); SnapStart is not available for container images.
+    from snapshot_restore_py import register_after_restore
+except ImportError:
+    register_after_restore = None
+
+def init():
+    """
+    Warm up the calculation paths for every built-in currency.
+
+    Runs once per execution environment during the Lambda init phase.
+    Currency tables are already built when currencies is imported, and
+    the warm-up uses its own Random so the global random state is left alone.
+    """
+    rng = random.Random(0)
+    for currency_config in CURRENCIES.values():
+        smallest = currency_config['denominations'][-1][1]
+        change_cents = sum(value for _, value in currency_config['denominations']) + smallest
+        calculate_minimal_change(change_cents, currency_config)
+        calculate_random_change(change_cents, currency_config, rng)
+    process_file_content("2.13,3.00\n2.14,3.00", 'USD', seed=0, profile='off')
+
+def after_restore():
+    """
+    Reseed the global random module after a SnapStart restore (zip deployment).
+
+    Every environment restored from the same snapshot would otherwise
+    produce the same unseeded "random" change.
+    """
+    random.seed()
 
 def lambda_handler(event, context):
     """
@@ -20,7 +54,10 @@ def lambda_handler(event, context):
     """
     try:
         # Extract currency from query parameters or default to USD
-        currency = event.get('queryStringParameters', {}).get('currency', 'USD').upper()
+        params = event.get('queryStringParameters', {})
+        currency = params.get('currency', 'USD').upper()
+        # Optional batch seed for reproducible random change
+        seed = params.get('seed')
 
         # Check if this is a custom currency upload
         if event.get('path') == '/upload-currency' or event.get('requestContext', {}).get('httpMethod') == 'POST':
@@ -63,13 +100,54 @@ def lambda_handler(event, context):
         if 'body' in event and event.get('body') and not event.get('path') == '/upload-currency':
             # Process file content
             file_content = event['body']
-            output_content = process_file_content(file_content, currency)
+            error_policy = params.get('errors', 'continue')
+            if error_policy not in ERROR_POLICIES:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({
+                        'error': f'Unsupported error policy: {error_policy}',
+                        'supported_error_policies': list(ERROR_POLICIES)
+                    })
+                }
+            try:
+                max_errors = int(params['max_errors']) if 'max_errors' in params else None
+            except ValueError:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': 'max_errors must be a positive integer'})
+                }
+            try:
+                errors = BatchErrors(error_policy, max_errors)
+            except ValueError as e:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': str(e)})
+                }
+
+            output_content = process_file_content(file_content, currency, seed, errors=errors)
+
+            if errors.aborted:
+                return {
+                    'statusCode': 422,
+                    'body': json.dumps(dict(errors.to_dict(), error=f'Batch aborted after {len(errors)} errors')),
+                    'headers': {'Content-Type': 'application/json'}
+                }
+            if error_policy == 'partial':
+                return {
+                    'statusCode': 200,
+                    'body': json.dumps(dict(errors.to_dict(), output=output_content)),
+                    'headers': {
+                        'Content-Type': 'application/json',
+                        'X-Currency': currency
+                    }
+                }
             return {
                 'statusCode': 200,
                 'body': output_content,
                 'headers': {
                     'Content-Type': 'text/plain',
-                    'X-Currency': currency
+                    'X-Currency': currency,
+                    'X-Error-Count': str(len(errors))
                 }
             }
 
@@ -101,7 +179,12 @@ def lambda_handler(event, context):
                         'change_calculation': {
                             'method': 'POST',
                             'body': 'file_content',
-                            'query_params': {'currency': 'USD|EUR|COP|CUSTOM'},
+                            'query_params': {
+                                'currency': 'USD|EUR|COP|CUSTOM',
+                                'seed': 'optional',
+                                'errors': 'continue|fail_fast|partial',
+                                'max_errors': 'optional (fail_fast, default 1)'
+                            },
                             'response': 'processed_output'
                         },
                         'single_transaction': {
@@ -136,30 +219,59 @@ def lambda_handler(event, context):
             'body': json.dumps({'error': str(e)})
         }
 
-def process_file_content(file_content, currency='USD'):
+def process_file_content(file_content, currency='USD', seed=None, start_line=1, profile=None,
+                         errors=None):
     """
     Process file content and return results.
 
     Args:
         file_content (str): Content of the input file
         currency (str): Currency code
+        seed (str|int): Batch seed for reproducible output. Defaults to None.
+        start_line (int): Line number of the first line, for sharded batches
+        profile (str): Profile mode ('all' or every Nth row). Defaults to the
+            CHANGE_CALC_PROFILE environment variable; output goes to the log.
+        errors (BatchErrors): Error collector and policy. Defaults to continue.
 
     Returns:
         str: Processed output content
     """
+    if errors is None:
+        errors = BatchErrors()
+    profiler = get_profiler(profile)
+    if profiler and profiler.whole_run:
+        profiler.enable()
     output_lines = []
-    for line_num, line in enumerate(StringIO(file_content), 1):
-        line = line.strip()
-        if not line:
-            continue
+    try:
+        for line_num, line in enumerate(StringIO(file_content), start_line):
+            if not line.strip():
+                continue
+
+            sampled = profiler is not None and profiler.samples(line_num)
+            if sampled:
+                profiler.enable()
+            try:
+                result = process_row(line, line_num, currency, seed)
+            except RowError as e:
+                result = errors.add(line_num, e)
+            except Exception as e:
+                # Keep the rows already processed; record the failure against this row
+                result = errors.add(line_num, RowError('exception', str(e), type(e).__name__))
+            if sampled:
+                profiler.disable()
 
-        parts = line.split(',')
-        if len(parts) != 2:
-            output_lines.append(f"Error: Invalid line format on line {line_num}")
-            continue
+            if errors.aborted:
+                break
+            if result is not None:
+                output_lines.append(result)
+    finally:
+        if profiler:
+            profiler.disable()
+            if profiler.profiled:
+                profiler.log()
 
-        owed_str, paid_str = parts
-        result = calculate_change(owed_str.strip(), paid_str.strip(), currency)
-        output_lines.append(result)
+    return '\n'.join(output_lines)
 
-    return '\n'.join(output_lines)
\ No newline at end of file
+init()
+if register_after_restore:
+    register_after_restore(after_restore)
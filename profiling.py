@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling for batch runs.
+Creative Cash Draw Solutions - Change Calculator
+
+Profiling is off unless the CHANGE_CALC_PROFILE environment variable (or the
+profile argument of the batch functions) is set:
+
+    all   profile the whole run
+    N     profile every Nth row (N=1 profiles every row, but not file I/O)
+
+Results are written as collapsed stacks (one "frame;frame;frame microseconds"
+line per stack, as read by flamegraph.pl, speedscope and inferno) and a
+per-function summary.
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+from time import perf_counter
+
+PROFILE_ENV_VAR = 'CHANGE_CALC_PROFILE'
+
+def _frame_name(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def _builtin_name(func):
+    module = getattr(func, '__module__', None)
+    name = getattr(func, '__qualname__', repr(func))
+    return f"{module}.{name}" if module else name
+
+class StackProfiler:
+    """
+    Tracing profiler that records self time per call stack.
+
+    Only runs between enable() and disable(), so rows that are not
+    sampled run at full speed.
+    """
+
+    def __init__(self, sample_every=None):
+        """
+        Args:
+            sample_every (int): Profile every Nth row, or None for the whole run
+        """
+        self.sample_every = sample_every
+        self.whole_run = sample_every is None
+        self.stacks = defaultdict(float)
+        self.calls = defaultdict(int)
+        self._stack = []
+        self._last = 0.0
+        self._enabled = False
+        self._previous = None
+
+    @property
+    def profiled(self):
+        """bool: True if anything has been recorded."""
+        return bool(self.stacks)
+
+    def samples(self, line_num):
+        """
+        Check whether a row should be profiled on its own.
+
+        Args:
+            line_num (int): 1-based line number of the row
+
+        Returns:
+            bool: True if the row is sampled
+        """
+        return not self.whole_run and (line_num - 1) % self.sample_every == 0
+
+    def enable(self):
+        """Start profiling, rooted at the calling function."""
+        self._stack = [_frame_name(sys._getframe(1).f_code)]
+        # Keep any profiler already installed (e.g. cProfile) to restore later
+        self._previous = sys.getprofile()
+        self._enabled = True
+        self._last = perf_counter()
+        sys.setprofile(self._trace)
+
+    def disable(self):
+        """Stop profiling and restore the previously installed profile hook."""
+        if not self._enabled:
+            return
+        if self._previous is not None and not callable(self._previous):
+            # C profilers such as cProfile.Profile must re-install themselves
+            self._previous.enable()
+        else:
+            sys.setprofile(self._previous)
+        self._enabled = False
+        self._previous = None
+        self._stack = []
+
+    def _trace(self, frame, event, arg):
+        now = perf_counter()
+        stack = self._stack
+        if frame.f_code in _IGNORED_CODES:
+            return
+        self.stacks[stack[-1]] += now - self._last
+
+        if event == 'call':
+            name = _frame_name(frame.f_code)
+            stack.append(f"{stack[-1]};{name}")
+            self.calls[name] += 1
+        elif event == 'c_call':
+            name = _builtin_name(arg)
+            stack.append(f"{stack[-1]};{name}")
+            self.calls[name] += 1
+        elif len(stack) > 1:
+            # return, c_return, c_exception
+            stack.pop()
+
+        self._last = perf_counter()
+
+    def collapsed(self):
+        """
+        Get the profile as collapsed stacks.
+
+        Returns:
+            list: Lines of "frame;frame;frame microseconds"
+        """
+        lines = []
+        for stack, seconds in sorted(self.stacks.items()):
+            micros = round(seconds * 1000000)
+            if micros > 0:
+                lines.append(f"{stack} {micros}")
+        return lines
+
+    def summary(self, limit=None):
+        """
+        Get a per-function summary sorted by self time.
+
+        Args:
+            limit (int): Maximum number of functions to include
+
+        Returns:
+            list: Formatted summary lines
+        """
+        self_time = defaultdict(float)
+        total_time = defaultdict(float)
+        for stack, seconds in self.stacks.items():
+            frames = stack.split(';')
+            self_time[frames[-1]] += seconds
+            # Count each function once per stack so recursion is not double counted
+            for name in set(frames):
+                total_time[name] += seconds
+
+        names = sorted(self_time, key=self_time.get, reverse=True)[:limit]
+        lines = [f"{'calls':>10} {'self_ms':>10} {'total_ms':>10}  function"]
+        for name in names:
+            lines.append(f"{self.calls.get(name, 0):>10} {self_time[name] * 1000:>10.3f} "
+                         f"{total_time[name] * 1000:>10.3f}  {name}")
+        return lines
+
+    def write(self, output_file_path):
+        """
+        Write the profile alongside an output file.
+
+        Creates <output>.collapsed and <output>.profile.txt.
+
+        Args:
+            output_file_path (str): Path of the batch output file
+        """
+        with open(f"{output_file_path}.collapsed", 'w') as f:
+            f.writelines(line + '\n' for line in self.collapsed())
+        with open(f"{output_file_path}.profile.txt", 'w') as f:
+            f.writelines(line + '\n' for line in self.summary())
+
+    def log(self, limit=50):
+        """
+        Print the profile to stdout (the log stream when running in Lambda).
+
+        Args:
+            limit (int): Maximum number of functions in the summary
+        """
+        print("PROFILE collapsed stacks:")
+        for line in self.collapsed():
+            print(f"PROFILE {line}")
+        print("PROFILE summary:")
+        for line in self.summary(limit):
+            print(f"PROFILE {line}")
+
+_IGNORED_CODES = {StackProfiler.enable.__code__, StackProfiler.disable.__code__}
+
+def get_profiler(mode=None):
+    """
+    Create a profiler for a batch run.
+
+    Args:
+        mode (str): 'all', a row interval, or None to read CHANGE_CALC_PROFILE
+
+    Returns:
+        StackProfiler: Profiler, or None if profiling is off
+    """
+    if mode is None:
+        mode = os.environ.get(PROFILE_ENV_VAR, '')
+    mode = str(mode).strip().lower()
+    if mode in ('', '0', 'off', 'false'):
+        return None
+    if mode == 'all':
+        return StackProfiler()
+    try:
+        sample_every = int(mode)
+    except ValueError:
+        sample_every = 0
+    if sample_every < 1:
+        print(f"Warning: Invalid profile mode '{mode}', profiling disabled")
+        return None
+    return StackProfiler(sample_every)
+
+def main(argv=None):
+    from change_calculator import process_file
+
+    parser = argparse.ArgumentParser(description='Profile a batch run')
+    parser.add_argument('input_file')
+    parser.add_argument('output_file')
+    parser.add_argument('--currency', default='USD')
+    parser.add_argument('--seed', default=None)
+    parser.add_argument('--profile', default='all', help="'all' or profile every Nth row")
+    args = parser.parse_args(argv)
+
+    process_file(args.input_file, args.output_file, args.currency.upper(), args.seed, args.profile)
+    print(f"Profile written to {args.output_file}.collapsed and {args.output_file}.profile.txt")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import json
+import unittest
+from unittest.mock import patch
+from batch_errors import BatchErrors
+from batch_test_utils import batch_files
+from change_calculator import process_file
+from lambda_function import lambda_handler
+
+INPUT = "2.14,3.00\nbad line\n5.00,3.00\n5.00,5.00\n"
+
+def read_lines(path):
+    with open(path) as f:
+        return f.read().splitlines()
+
+class TestBatchErrors(unittest.TestCase):
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            BatchErrors('ignore')
+
+    def test_max_errors_requires_fail_fast(self):
+        with self.assertRaises(ValueError):
+            BatchErrors('partial', max_errors=5)
+
+    def test_continue_keeps_errors_inline(self):
+        with batch_files(INPUT) as (input_path, output_path):
+            errors = process_file(input_path, output_path, 'USD')
+            output = read_lines(output_path)
+        self.assertEqual(errors.records, [(2, 'invalid_line', None), (3, 'insufficient_payment', None)])
+        self.assertEqual(output[1], "Error: Invalid line format on line 2")
+        self.assertEqual(output[2], "Error: Insufficient payment")
+
+    def test_fail_fast_stops_at_limit(self):
+        with batch_files(INPUT) as (input_path, output_path):
+            errors = process_file(input_path, output_path, 'USD', errors=BatchErrors('fail_fast'))
+            output = read_lines(output_path)
+        self.assertTrue(errors.aborted)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(output, ["3 quarters, 1 dime, 1 penny"])
+
+    def test_partial_leaves_errors_out(self):
+        with batch_files(INPUT) as (input_path, output_path):
+            errors = process_file(input_path, output_path, 'USD', errors=BatchErrors('partial'))
+            output = read_lines(output_path)
+        self.assertFalse(errors.aborted)
+        self.assertEqual([line_num for line_num, _, _ in errors.records], [2, 3])
+        self.assertEqual(output, ["3 quarters, 1 dime, 1 penny", "No change owed"])
+
+    def test_unexpected_exception_keeps_completed_rows(self):
+        with batch_files(INPUT) as (input_path, output_path):
+            with patch('change_calculator.compute_change', side_effect=["1 dime", RuntimeError("boom"), "No change owed"]):
+                errors = process_file(input_path, output_path, 'USD', errors=BatchErrors('partial'))
+            output = read_lines(output_path)
+        self.assertIn((3, 'exception', 'RuntimeError'), errors.records)
+        self.assertEqual(output, ["1 dime", "No change owed"])
+
+    def test_invalid_encoding_fails_its_row(self):
+        content = b"2.14,3.00\n5.00,5.00\n\xff1.00,2.00\n1.00,2.00\n"
+        with batch_files(content, 'wb') as (input_path, output_path):
+            errors = process_file(input_path, output_path, 'USD', errors=BatchErrors('fail_fast'))
+            output = read_lines(output_path)
+        self.assertTrue(errors.aborted)
+        self.assertEqual(errors.records[0][:2], (3, 'invalid_encoding'))
+        self.assertEqual(output, ["3 quarters, 1 dime, 1 penny", "No change owed"])
+
+    def test_missing_file_aborts(self):
+        with batch_files(INPUT) as (input_path, output_path):
+            errors = process_file(input_path + '.missing', output_path, 'USD')
+        self.assertTrue(errors.aborted)
+        self.assertEqual(errors.records, [(None, 'file_not_found', None)])
+
+class TestLambdaBatchErrors(unittest.TestCase):
+
+    def handle(self, **params):
+        return lambda_handler({'body': INPUT, 'queryStringParameters': params}, {})
+
+    def test_continue_counts_errors(self):
+        response = self.handle()
+        self.assertEqual(response['statusCode'], 200)
+        self.assertEqual(response['headers']['X-Error-Count'], '2')
+        self.assertEqual(response['body'].splitlines()[1], "Error: Invalid line format on line 2")
+
+    def test_partial_returns_error_index(self):
+        response = self.handle(errors='partial')
+        self.assertEqual(response['statusCode'], 200)
+        body = json.loads(response['body'])
+        self.assertEqual(body['errors'], [[2, 'invalid_line', None], [3, 'insufficient_payment', None]])
+        self.assertEqual(body['output'], "3 quarters, 1 dime, 1 penny\nNo change owed")
+
+    def test_fail_fast_returns_422(self):
+        response = self.handle(errors='fail_fast', max_errors='2')
+        self.assertEqual(response['statusCode'], 422)
+        body = json.loads(response['body'])
+        self.assertTrue(body['aborted'])
+        self.assertEqual(body['error_count'], 2)
+
+    def test_bad_policy_returns_400(self):
+        self.assertEqual(self.handle(errors='ignore')['statusCode'], 400)
+
+    def test_max_errors_without_fail_fast_returns_400(self):
+        self.assertEqual(self.handle(errors='partial', max_errors='3')['statusCode'], 400)
+        self.assertEqual(self.handle(max_errors='3')['statusCode'], 400)
+
+    def test_bad_max_errors_returns_400(self):
+        self.assertEqual(self.handle(errors='fail_fast', max_errors='0')['statusCode'], 400)
+        self.assertEqual(self.handle(errors='fail_fast', max_errors='x')['statusCode'], 400)
+
+    def test_row_exception_keeps_completed_rows(self):
+        with patch('change_calculator.compute_change', side_effect=["1 dime", RuntimeError("boom"), "No change owed"]):
+            response = self.handle(errors='partial')
+        self.assertEqual(response['statusCode'], 200)
+        body = json.loads(response['body'])
+        self.assertEqual(body['output'], "1 dime\nNo change owed")
+        self.assertIn([3, 'exception', 'RuntimeError'], body['errors'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
-from change_calculator import calculate_change, calculate_minimal_change, calculate_random_change
+from change_calculator import calculate_change, calculate_minimal_change, calculate_random_change, row_rng
 from currencies import get_currency_config
+from lambda_function import process_file_content
 
 class TestChangeCalculator(unittest.TestCase):
 
@@ -78,5 +79,26 @@ class TestChangeCalculator(unittest.TestCase):
         # Should contain denomination names
         self.assertTrue(any(denom in result for denom in ['dollar', 'quarter', 'dime', 'nickel', 'penny']))
 
+    def test_seeded_random_change_reproducible(self):
+        # Same seed and row should always give the same random change
+        result1 = calculate_change("2.13", "3.00", "USD", row_rng("batch", 7))
+        result2 = calculate_change("2.13", "3.00", "USD", row_rng("batch", 7))
+        self.assertEqual(result1, result2)
+
+    def test_row_rng_without_seed(self):
+        # No seed falls back to the global random module
+        import random
+        self.assertIs(row_rng(None, 1), random)
+
+    def test_sharded_batch_matches_single_run(self):
+        # Splitting a seeded batch into shards must not change any row's output
+        lines = ["2.13,3.00", "3.00,10.00", "0.99,5.00", "6.00,9.99", "1.50,2.00", "0.30,7.77"]
+        full = process_file_content("\n".join(lines), 'USD', seed='shard')
+        for size in (1, 2, 4):
+            shards = [process_file_content("\n".join(lines[k:k + size]), 'USD', seed='shard',
+                                           start_line=k + 1)
+                      for k in range(0, len(lines), size)]
+            self.assertEqual("\n".join(shards), full)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -28,18 +28,15 @@ def test_lambda_container():
         print("Then test with curl:")
         print('curl -X POST http://localhost:9000/2015-03-31/functions/function/invocations -d \'{"body": "2.13,3.00"}\'')
         print()
+        print("To measure cold starts against the emulator, run:")
+        print("python bench_cold_start.py --image change-calculator:latest")
+        print()
 
         # Simulate what the Lambda function would return
-        # Import without boto3 dependency for testing
         import sys
         import os
         sys.path.insert(0, os.path.dirname(__file__))
 
-        # Mock boto3 to avoid import error
-        import sys
-        from unittest.mock import MagicMock
-        sys.modules['boto3'] = MagicMock()
-
         from lambda_function import lambda_handler
 
         # Test change calculation
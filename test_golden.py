@@ -0,0 +1,30 @@
+import os
+import unittest
+from batch_test_utils import batch_files
+from golden import chunk_digests, check_golden, record_golden
+
+INPUT = "2.13,3.00\n2.14,3.00\n5.00,5.00\n0.99,5.00\n3.00,10.00\n"
+
+class TestGolden(unittest.TestCase):
+
+    def test_chunk_digests(self):
+        # 5 lines in chunks of 2 gives 3 chunks
+        with batch_files(INPUT) as (input_path, _):
+            self.assertEqual(len(chunk_digests(input_path, 2)), 3)
+
+    def test_record_then_check(self):
+        with batch_files(INPUT) as (input_path, output_path):
+            golden_path = os.path.join(os.path.dirname(output_path), 'golden.json')
+            record_golden(input_path, golden_path, 'USD', 'test', 2)
+            self.assertEqual(check_golden(input_path, golden_path), [])
+
+    def test_check_detects_changed_chunk(self):
+        with batch_files(INPUT) as (input_path, output_path):
+            golden_path = os.path.join(os.path.dirname(output_path), 'golden.json')
+            record_golden(input_path, golden_path, 'USD', 'test', 2)
+            with open(input_path, 'a') as f:
+                f.write("1.00,2.00\n")
+            self.assertEqual(check_golden(input_path, golden_path), [2])
+
+if __name__ == '__main__':
+    unittest.main()
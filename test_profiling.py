@@ -0,0 +1,90 @@
+import io
+import os
+import sys
+import unittest
+from contextlib import redirect_stdout
+from batch_test_utils import batch_files
+from change_calculator import process_file
+from lambda_function import process_file_content
+from profiling import get_profiler
+
+INPUT = "2.13,3.00\n2.14,3.00\n5.00,5.00\n0.99,5.00\n"
+
+class TestProfiling(unittest.TestCase):
+
+    def test_profiler_modes(self):
+        self.assertIsNone(get_profiler('off'))
+        self.assertIsNone(get_profiler('-5'))
+        self.assertTrue(get_profiler('all').whole_run)
+        profiler = get_profiler('2')
+        self.assertTrue(profiler.samples(1))
+        self.assertFalse(profiler.samples(2))
+        self.assertTrue(profiler.samples(3))
+
+    def test_profiling_off_writes_nothing(self):
+        with batch_files(INPUT) as (input_path, output_path):
+            process_file(input_path, output_path, 'USD', profile='off')
+            self.assertFalse(os.path.exists(output_path + '.collapsed'))
+
+    def test_missing_input_writes_no_profile(self):
+        with batch_files(INPUT) as (input_path, output_path):
+            process_file(input_path + '.missing', output_path, 'USD', profile='all')
+            self.assertFalse(os.path.exists(output_path + '.collapsed'))
+
+    def test_profile_files_written(self):
+        with batch_files(INPUT) as (input_path, output_path):
+            process_file(input_path, output_path, 'USD', profile='all')
+            with open(output_path + '.collapsed') as f:
+                lines = f.read().splitlines()
+            # Each line is "frame;frame;... microseconds"
+            self.assertTrue(any('compute_change' in line for line in lines))
+            for line in lines:
+                stack, micros = line.rsplit(' ', 1)
+                self.assertTrue(stack.startswith('process_file'))
+                self.assertGreater(int(micros), 0)
+            self.assertTrue(os.path.exists(output_path + '.profile.txt'))
+
+    def test_previous_profile_hook_restored(self):
+        def hook(frame, event, arg):
+            pass
+        previous = sys.getprofile()
+        sys.setprofile(hook)
+        try:
+            with batch_files(INPUT) as (input_path, output_path):
+                process_file(input_path, output_path, 'USD', profile='1')
+            restored = sys.getprofile()
+        finally:
+            sys.setprofile(previous)
+        self.assertIs(restored, hook)
+
+    def test_cprofile_restored(self):
+        import cProfile
+        previous = sys.getprofile()
+        outer = cProfile.Profile()
+        outer.enable()
+        try:
+            with redirect_stdout(io.StringIO()):
+                process_file_content(INPUT, 'USD', profile='1')
+            restored = sys.getprofile()
+        finally:
+            outer.disable()
+            sys.setprofile(previous)
+        self.assertIs(restored, outer)
+
+    def test_file_content_profile_logged(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            process_file_content(INPUT, 'USD', profile='all')
+        lines = out.getvalue().splitlines()
+        self.assertIn("PROFILE collapsed stacks:", lines)
+        self.assertTrue(any(line.startswith("PROFILE process_file_content") and 'compute_change' in line
+                            for line in lines))
+
+    def test_file_content_profile_off_logs_nothing(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            process_file_content(INPUT, 'USD', profile='off')
+        self.assertEqual(out.getvalue(), "")
+
+if __name__ == '__main__':
+    unittest.main()